@@ -1,4 +1,4 @@
-import copy
+from concurrent.futures import ThreadPoolExecutor
 
 from astropy.wcs import WCS
 import numpy as np
@@ -6,7 +6,7 @@ from ndcube import NDCollection
 
 import astropy.units as u
 from astropy.io import fits
-from astropy.time import Time, TimeDelta
+from astropy.time import Time
 
 from sunraster import RasterSequence, SpectrogramCube
 
@@ -22,6 +22,16 @@ DN_UNIT = {
                       DETECTOR_GAIN["FUV"] / DETECTOR_YIELD["FUV"] * u.photon)}
 READOUT_NOISE = {"NUV": 1.2 * DN_UNIT["NUV"],
                  "FUV": 3.1 * DN_UNIT["FUV"]}
+# Scalar forms of the above used when deriving uncertainties so that
+# unit conversions are not repeated for every file and spectral window.
+DN_TO_PHOTON = {detector: (1 * unit).to_value(u.photon) for detector, unit in DN_UNIT.items()}
+PHOTON_TO_DN = {detector: (1 * u.photon).to_value(unit) for detector, unit in DN_UNIT.items()}
+READOUT_NOISE_PHOTON_SQUARED = {detector: noise.to_value(u.photon)**2
+                                for detector, noise in READOUT_NOISE.items()}
+# Maximum number of files read concurrently.
+MAX_READ_THREADS = 8
+# Value assigned to bad or missing pixels in level 2 spectrograph files.
+BAD_PIXEL_VALUE = -200.
 
 
 def read_iris_spectrograph_level2_fits(
@@ -40,180 +50,316 @@ def read_iris_spectrograph_level2_fits(
         OBS number.
     spectral_windows: iterable of `str` or `str`
         Spectral windows to extract from files.  Default=None, implies, extract all
-        spectral windows.
+        spectral windows.  Windows are returned in the order they appear in the files,
+        not the order in which they are requested, and each window is returned once.
+        A `ValueError` is raised if any requested window is not in the files.
+    uncertainty: `bool`
+        If True, the uncertainty of the data is derived from the shot and readout noise.
+        This requires reading all the data and allocating an array the size of the data.
+        Default=True
+    memmap: `bool`
+        If True, files are read with memory mapping so data are only loaded when accessed.
+        In this case data are not scaled by BSCALE/BZERO and bad pixels are not masked,
+        as either would require loading all the data.  Setting uncertainty=False as well
+        avoids reading the data at all.
+        Default=False
 
     Returns
     -------
     result: `ndcube.NDCollection`
+        Extra coordinates are shared between the spectral windows of each file and so
+        are read-only.  Copy them before modifying them.
     """
     if isinstance(filenames, str):
         filenames = [filenames]
-    for f, filename in enumerate(filenames):
-        hdulist = fits.open(filename, memmap=memmap, do_not_scale_image_data=memmap)
+    # Derive OBS-level metadata and the windows to be read from the first file.
+    with fits.open(filenames[0], memmap=memmap, do_not_scale_image_data=memmap) as hdulist:
         hdulist.verify('fix')
-        if f == 0:
-            # Determine number of raster positions in a scan
-            int(hdulist[0].header["NRASTERP"])
-            # Collecting the window observations.
-            windows_in_obs = np.array([hdulist[0].header["TDESC{0}".format(i)]
-                                       for i in range(1, hdulist[0].header["NWIN"] + 1)])
-            # If spectral_window is not set then get every window.
-            # Else take the appropriate windows
-            if not spectral_windows:
-                spectral_windows_req = windows_in_obs
-                window_fits_indices = range(1, len(hdulist) - 2)
+        primary_header = hdulist[0].header
+        # Determine raster positions in a scan.  These are the same for all files in an OBS.
+        # If OBS is not a raster, raster positions are not included as a coordinate.
+        n_raster_positions = int(primary_header["NRASTERP"])
+        if n_raster_positions > 1:
+            raster_positions = np.arange(n_raster_positions)
+            # Shared by cubes from all files so make read-only.
+            raster_positions.setflags(write=False)
+        else:
+            raster_positions = None
+        # Collecting the window observations.
+        windows_in_obs = np.array([primary_header["TDESC{0}".format(i)]
+                                   for i in range(1, primary_header["NWIN"] + 1)])
+        # If spectral_window is not set then get every window.
+        # Else take the appropriate windows
+        if not spectral_windows:
+            spectral_windows_req = windows_in_obs
+            window_fits_indices = range(1, len(hdulist) - 2)
+        else:
+            if isinstance(spectral_windows, str):
+                spectral_windows_req = [spectral_windows]
             else:
-                if isinstance(spectral_windows, str):
-                    spectral_windows_req = [spectral_windows]
-                else:
-                    spectral_windows_req = spectral_windows
-                spectral_windows_req = np.asarray(spectral_windows_req, dtype="U")
-                window_is_in_obs = np.asarray(
-                    [window in windows_in_obs for window in spectral_windows_req])
-                if not all(window_is_in_obs):
-                    missing_windows = window_is_in_obs == False
-                    raise ValueError("Spectral windows {0} not in file {1}".format(
-                        spectral_windows[missing_windows], filenames[0]))
-                window_fits_indices = np.nonzero(np.in1d(windows_in_obs,
-                                                         spectral_windows))[0] + 1
-            # Generate top level meta dictionary from first file
-            # main header.
-            top_meta = {"TELESCOP": hdulist[0].header["TELESCOP"],
-                        "INSTRUME": hdulist[0].header["INSTRUME"],
-                        "DATA_LEV": hdulist[0].header["DATA_LEV"],
-                        "OBSID": hdulist[0].header["OBSID"],
-                        "OBS_DESC": hdulist[0].header["OBS_DESC"],
-                        "STARTOBS": Time(hdulist[0].header["STARTOBS"]),
-                        "ENDOBS": Time(hdulist[0].header["ENDOBS"]),
-                        "SAT_ROT": hdulist[0].header["SAT_ROT"] * u.deg,
-                        "AECNOBS": int(hdulist[0].header["AECNOBS"]),
-                        "FOVX": hdulist[0].header["FOVX"] * u.arcsec,
-                        "FOVY": hdulist[0].header["FOVY"] * u.arcsec,
-                        "SUMSPTRN": hdulist[0].header["SUMSPTRN"],
-                        "SUMSPTRF": hdulist[0].header["SUMSPTRF"],
-                        "SUMSPAT": hdulist[0].header["SUMSPAT"],
-                        "NEXPOBS": hdulist[0].header["NEXPOBS"],
-                        "NRASTERP": hdulist[0].header["NRASTERP"],
-                        "KEYWDDOC": hdulist[0].header["KEYWDDOC"]}
-            # Initialize meta dictionary for each spectral_window
-            window_metas = {}
-            for i, window_name in enumerate(spectral_windows_req):
-                if "FUV" in hdulist[0].header["TDET{0}".format(window_fits_indices[i])]:
-                    spectral_summing = hdulist[0].header["SUMSPTRF"]
-                else:
-                    spectral_summing = hdulist[0].header["SUMSPTRN"]
-                window_metas[window_name] = {
-                    "detector type":
-                        hdulist[0].header["TDET{0}".format(window_fits_indices[i])],
-                    "spectral window":
-                        hdulist[0].header["TDESC{0}".format(window_fits_indices[i])],
-                    "brightest wavelength":
-                        hdulist[0].header["TWAVE{0}".format(window_fits_indices[i])],
-                    "min wavelength":
-                        hdulist[0].header["TWMIN{0}".format(window_fits_indices[i])],
-                    "max wavelength":
-                        hdulist[0].header["TWMAX{0}".format(window_fits_indices[i])],
-                    "SAT_ROT": hdulist[0].header["SAT_ROT"],
-                    "spatial summing": hdulist[0].header["SUMSPAT"],
-                    "spectral summing": spectral_summing
-                }
-            # Create a empty list for every spectral window and each
-            # spectral window is a key for the dictionary.
-            data_dict = dict([(window_name, list())
-                              for window_name in spectral_windows_req])
+                spectral_windows_req = spectral_windows
+            spectral_windows_req = np.asarray(spectral_windows_req, dtype="U")
+            window_is_in_obs = np.isin(spectral_windows_req, windows_in_obs)
+            if not window_is_in_obs.all():
+                raise ValueError("Spectral windows {0} not in file {1}".format(
+                    spectral_windows_req[~window_is_in_obs], filenames[0]))
+            # Order requested windows as in the file so they line up with their HDU indices.
+            window_is_requested = np.isin(windows_in_obs, spectral_windows_req)
+            spectral_windows_req = windows_in_obs[window_is_requested]
+            window_fits_indices = np.nonzero(window_is_requested)[0] + 1
+        # Generate top level meta dictionary from first file
+        # main header.
+        top_meta = {"TELESCOP": primary_header["TELESCOP"],
+                    "INSTRUME": primary_header["INSTRUME"],
+                    "DATA_LEV": primary_header["DATA_LEV"],
+                    "OBSID": primary_header["OBSID"],
+                    "OBS_DESC": primary_header["OBS_DESC"],
+                    "STARTOBS": Time(primary_header["STARTOBS"]),
+                    "ENDOBS": Time(primary_header["ENDOBS"]),
+                    "SAT_ROT": u.Quantity(primary_header["SAT_ROT"], u.deg),
+                    "AECNOBS": int(primary_header["AECNOBS"]),
+                    "FOVX": u.Quantity(primary_header["FOVX"], u.arcsec),
+                    "FOVY": u.Quantity(primary_header["FOVY"], u.arcsec),
+                    "SUMSPTRN": primary_header["SUMSPTRN"],
+                    "SUMSPTRF": primary_header["SUMSPTRF"],
+                    "SUMSPAT": primary_header["SUMSPAT"],
+                    "NEXPOBS": primary_header["NEXPOBS"],
+                    "NRASTERP": primary_header["NRASTERP"],
+                    "KEYWDDOC": primary_header["KEYWDDOC"]}
+        # Initialize meta dictionary for each spectral_window
+        window_metas = {window_name: _build_window_meta(primary_header, window_fits_index)
+                        for window_name, window_fits_index in zip(spectral_windows_req,
+                                                                  window_fits_indices)}
+    # Read files in parallel as FITS I/O and array operations mostly release the GIL.
+    # executor.map returns results in the order of filenames.
+    # Files from the same OBS often share window headers so share WCS objects between them.
+    wcs_cache = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_THREADS, len(filenames))) as executor:
+        file_cubes = list(executor.map(
+            lambda filename: _read_single_iris_spectrograph_level2_fits(
+                filename, spectral_windows_req, window_fits_indices,
+                raster_positions=raster_positions, uncertainty=uncertainty, memmap=memmap,
+                wcs_cache=wcs_cache),
+            filenames))
+    # Construct dictionary of SpectrogramSequences for spectral windows
+    window_data_pairs = [(window_name,
+                          RasterSequence([cubes[window_name] for cubes in file_cubes],
+                                         common_axis=0, meta=window_metas[window_name]))
+                         for window_name in spectral_windows_req]
+    # Initialize an NDCollection object.
+    return NDCollection(window_data_pairs, aligned_axes=(0, 1, 2), meta=top_meta)
+
+
+def _read_single_iris_spectrograph_level2_fits(filename, spectral_windows, window_fits_indices,
+                                               raster_positions=None, uncertainty=True,
+                                               memmap=False, wcs_cache=None):
+    """
+    Reads the requested spectral windows from a single IRIS level 2 spectrograph FITS file.
+
+    Parameters
+    ----------
+    filename: `str`
+        The name, including path, of the IRIS FITS file to read.
+
+    spectral_windows: iterable of `str`
+        Names of the spectral windows to read.
+
+    window_fits_indices: iterable of `int`
+        Index of the HDU holding each window in spectral_windows.
+
+    raster_positions: `numpy.ndarray` (optional)
+        Index of each raster position in a scan.  If None, OBS is treated as not a raster
+        and raster positions are not included as a coordinate.
+
+    uncertainty: `bool`
+        If True, the uncertainty of the data is derived.
+
+    memmap: `bool`
+        If True, FITS file is read with memory mapping.
+
+    wcs_cache: `dict` (optional)
+        Cache of WCS objects keyed by header shared between calls.  See `_wcs_from_header`.
+
+    Returns
+    -------
+    window_cubes: `dict` of `sunraster.SpectrogramCube`
+        A spectrogram cube for each spectral window.
+    """
+    if wcs_cache is None:
+        wcs_cache = {}
+    window_cubes = {}
+    with fits.open(filename, memmap=memmap, do_not_scale_image_data=memmap) as hdulist:
+        hdulist.verify('fix')
+        primary_header = hdulist[0].header
         # Determine extra coords for this raster.
-        times = (Time(hdulist[0].header["STARTOBS"]) +
-                 TimeDelta(hdulist[-2].data[:, hdulist[-2].header["TIME"]], format='sec'))
-        np.arange(int(hdulist[0].header["NRASTERP"]))
-        pztx = hdulist[-2].data[:, hdulist[-2].header["PZTX"]] * u.arcsec
-        pzty = hdulist[-2].data[:, hdulist[-2].header["PZTY"]] * u.arcsec
-        xcenix = hdulist[-2].data[:, hdulist[-2].header["XCENIX"]] * u.arcsec
-        ycenix = hdulist[-2].data[:, hdulist[-2].header["YCENIX"]] * u.arcsec
-        obs_vrix = hdulist[-2].data[:, hdulist[-2].header["OBS_VRIX"]] * u.m / u.s
-        ophaseix = hdulist[-2].data[:, hdulist[-2].header["OPHASEIX"]]
-        exposure_times_fuv = hdulist[-2].data[:, hdulist[-2].header["EXPTIMEF"]] * u.s
-        exposure_times_nuv = hdulist[-2].data[:, hdulist[-2].header["EXPTIMEN"]] * u.s
+        # Columns are taken as views of the auxiliary array without copying.
+        aux_data = hdulist[-2].data
+        aux_header = hdulist[-2].header
+        # Offset start time by the TIME column in a single operation on the TAI Julian date.
+        # This gives the same result as adding a TimeDelta to the UTC start time but is faster.
+        start_time = Time(primary_header["STARTOBS"])
+        start_tai = start_time.tai
+        times = Time(start_tai.jd1, start_tai.jd2 + aux_data[:, aux_header["TIME"]] / 86400.,
+                     format="jd", scale="tai").utc
+        times.format = start_time.format
+        pztx = u.Quantity(aux_data[:, aux_header["PZTX"]], u.arcsec, copy=False)
+        pzty = u.Quantity(aux_data[:, aux_header["PZTY"]], u.arcsec, copy=False)
+        xcenix = u.Quantity(aux_data[:, aux_header["XCENIX"]], u.arcsec, copy=False)
+        ycenix = u.Quantity(aux_data[:, aux_header["YCENIX"]], u.arcsec, copy=False)
+        obs_vrix = u.Quantity(aux_data[:, aux_header["OBS_VRIX"]], u.m / u.s, copy=False)
+        ophaseix = aux_data[:, aux_header["OPHASEIX"]]
+        exposure_times_fuv = u.Quantity(aux_data[:, aux_header["EXPTIMEF"]], u.s, copy=False)
+        exposure_times_nuv = u.Quantity(aux_data[:, aux_header["EXPTIMEN"]], u.s, copy=False)
+        # Coordinates are shared by all windows in the file so make them read-only.
+        # Otherwise an in-place change to one cube's coordinate would alter the others.
+        times.writeable = False
+        for coord in (pztx, pzty, xcenix, ycenix, obs_vrix, ophaseix,
+                      exposure_times_fuv, exposure_times_nuv):
+            coord.setflags(write=False)
         # If OBS is raster, include raster positions.  Otherwise don't.
-        if top_meta["NRASTERP"] > 1:
-            general_extra_coords = [("time", 0, times),
-                                    ("raster position", 0, np.arange(top_meta["NRASTERP"])),
+        if raster_positions is not None:
+            general_extra_coords = [("raster position", 0, raster_positions),
                                     ("pztx", 0, pztx), ("pzty", 0, pzty),
                                     ("xcenix", 0, xcenix), ("ycenix", 0, ycenix),
                                     ("obs_vrix", 0, obs_vrix), ("ophaseix", 0, ophaseix)]
         else:
-            general_extra_coords = [("time", 0, times),
-                                    ("pztx", 0, pztx), ("pzty", 0, pzty),
+            general_extra_coords = [("pztx", 0, pztx), ("pzty", 0, pzty),
                                     ("xcenix", 0, xcenix), ("ycenix", 0, ycenix),
                                     ("obs_vrix", 0, obs_vrix), ("ophaseix", 0, ophaseix)]
-        for i, window_name in enumerate(spectral_windows_req):
+        # Collect metadata relevant to single files.
+        try:
+            date_obs = Time(primary_header["DATE_OBS"])
+        except ValueError:
+            date_obs = None
+        try:
+            date_end = Time(primary_header["DATE_END"])
+        except ValueError:
+            date_end = None
+        file_meta = {"SAT_ROT": u.Quantity(primary_header["SAT_ROT"], u.deg),
+                     "DATE_OBS": date_obs,
+                     "DATE_END": date_end,
+                     "HLZ": bool(int(primary_header["HLZ"])),
+                     "SAA": bool(int(primary_header["SAA"])),
+                     "DSUN_OBS": u.Quantity(primary_header["DSUN_OBS"], u.m),
+                     "IAECEVFL": primary_header["IAECEVFL"],
+                     "IAECFLAG": primary_header["IAECFLAG"],
+                     "IAECFLFL": primary_header["IAECFLFL"],
+                     "KEYWDDOC": primary_header["KEYWDDOC"],
+                     "OBSID": primary_header["OBSID"],
+                     "OBS_DESC": primary_header["OBS_DESC"],
+                     "STARTOBS": start_time,
+                     "ENDOBS": Time(primary_header["ENDOBS"])
+                     }
+        for i, window_name in enumerate(spectral_windows):
+            window_hdu = hdulist[window_fits_indices[i]]
             # Determine values of properties dependent on detector type.
-            if "FUV" in hdulist[0].header["TDET{0}".format(window_fits_indices[i])]:
+            detector_type = primary_header["TDET{0}".format(window_fits_indices[i])]
+            if "FUV" in detector_type:
+                detector = "FUV"
                 exposure_times = exposure_times_fuv
-                DN_unit = DN_UNIT["FUV"]
-                readout_noise = READOUT_NOISE["FUV"]
-            elif "NUV" in hdulist[0].header["TDET{0}".format(window_fits_indices[i])]:
+            elif "NUV" in detector_type:
+                detector = "NUV"
                 exposure_times = exposure_times_nuv
-                DN_unit = DN_UNIT["NUV"]
-                readout_noise = READOUT_NOISE["NUV"]
             else:
                 raise ValueError("Detector type in FITS header not recognized.")
+            DN_unit = DN_UNIT[detector]
             # Derive WCS, data and mask for NDCube from file.
             # Sit-and-stare have a CDELT of 0 which causes issues in astropy WCS.
             # In this case, set CDELT to a tiny non-zero number.
-            if hdulist[window_fits_indices[i]].header["CDELT3"] == 0:
-                hdulist[window_fits_indices[i]].header["CDELT3"] = 1e-10
-            wcs_ = WCS(hdulist[window_fits_indices[i]].header)
+            # Do this on a copy so the header of the open file is left unchanged.
+            window_header = window_hdu.header
+            if window_header["CDELT3"] == 0:
+                window_header = window_header.copy()
+                window_header["CDELT3"] = 1e-10
+            wcs_ = _wcs_from_header(window_header, wcs_cache)
+            data = window_hdu.data
             if not memmap:
-                data_mask = hdulist[window_fits_indices[i]].data == -200.
+                data_mask = np.equal(data, BAD_PIXEL_VALUE)
             else:
                 data_mask = None
             # Derive extra coords for this spectral window.
-            window_extra_coords = copy.deepcopy(general_extra_coords)
-            window_extra_coords.append(("exposure time", 0, exposure_times))
-            # Collect metadata relevant to single files.
-            try:
-                date_obs = Time(hdulist[0].header["DATE_OBS"])
-            except ValueError:
-                date_obs = None
-            try:
-                date_end = Time(hdulist[0].header["DATE_END"])
-            except ValueError:
-                date_end = None
-            single_file_meta = {"SAT_ROT": hdulist[0].header["SAT_ROT"] * u.deg,
-                                "DATE_OBS": date_obs,
-                                "DATE_END": date_end,
-                                "HLZ": bool(int(hdulist[0].header["HLZ"])),
-                                "SAA": bool(int(hdulist[0].header["SAA"])),
-                                "DSUN_OBS": hdulist[0].header["DSUN_OBS"] * u.m,
-                                "IAECEVFL": hdulist[0].header["IAECEVFL"],
-                                "IAECFLAG": hdulist[0].header["IAECFLAG"],
-                                "IAECFLFL": hdulist[0].header["IAECFLFL"],
-                                "KEYWDDOC": hdulist[0].header["KEYWDDOC"],
-                                "detector type":
-                                hdulist[0].header["TDET{0}".format(window_fits_indices[i])],
-                                "spectral window": window_name,
-                                "OBSID": hdulist[0].header["OBSID"],
-                                "OBS_DESC": hdulist[0].header["OBS_DESC"],
-                                "STARTOBS": Time(hdulist[0].header["STARTOBS"]),
-                                "ENDOBS": Time(hdulist[0].header["ENDOBS"])
-                                }
+            # Read-only coordinate arrays are shared between windows of a file rather than copied.
+            # Each window gets its own Time object so that attributes such as format can be
+            # changed independently.  Time.replicate shares the underlying arrays.
+            window_extra_coords = ([("time", 0, times.replicate())] + general_extra_coords +
+                                   [("exposure time", 0, exposure_times)])
+            # Add window-specific entries to metadata shared by all windows in file.
+            # Times and quantities are parsed once per file but copied for each window
+            # so that changing one window's metadata does not alter the others.
+            single_file_meta = {**file_meta,
+                                "detector type": detector_type,
+                                "spectral window": window_name}
+            for key in ("SAT_ROT", "DATE_OBS", "DATE_END", "DSUN_OBS", "STARTOBS", "ENDOBS"):
+                if single_file_meta[key] is not None:
+                    single_file_meta[key] = single_file_meta[key].copy()
             # Derive uncertainty of data
             if uncertainty:
-                out_uncertainty = u.Quantity(
-                    np.sqrt((hdulist[window_fits_indices[i]].data * DN_unit).to(u.photon).value +
-                            readout_noise.to(u.photon).value**2),
-                    unit=u.photon).to(DN_unit).value
+                # Combine shot and readout noise in photons and convert back to DN.
+                # Operate in place on a single array to avoid full-size temporaries.
+                out_uncertainty = data * DN_TO_PHOTON[detector]
+                out_uncertainty += READOUT_NOISE_PHOTON_SQUARED[detector]
+                np.sqrt(out_uncertainty, out=out_uncertainty)
+                out_uncertainty *= PHOTON_TO_DN[detector]
             else:
                 out_uncertainty = None
-            # Appending NDCube instance to the corresponding window key in dictionary's list.
-            data_dict[window_name].append(
-                SpectrogramCube(hdulist[window_fits_indices[i]].data, wcs=wcs_,
-                                uncertainty=out_uncertainty, unit=DN_unit, meta=single_file_meta,
-                                extra_coords=window_extra_coords, mask=data_mask))
-        hdulist.close()
-    # Construct dictionary of SpectrogramSequences for spectral windows
-    window_data_pairs = [(window_name, RasterSequence(data_dict[window_name], common_axis=0,
-                                                      meta=window_metas[window_name]))
-                         for window_name in spectral_windows_req]
-    # Initialize an NDCollection object.
-    return NDCollection(window_data_pairs, aligned_axes=(0, 1, 2), meta=top_meta)
+            window_cubes[window_name] = SpectrogramCube(
+                data, wcs=wcs_, uncertainty=out_uncertainty, unit=DN_unit,
+                meta=single_file_meta, extra_coords=window_extra_coords, mask=data_mask)
+    return window_cubes
+
+
+def _build_window_meta(primary_header, window_fits_index):
+    """
+    Returns the metadata of a spectral window from the primary header of an IRIS file.
+
+    Parameters
+    ----------
+    primary_header: `astropy.io.fits.Header`
+        The primary header of an IRIS level 2 spectrograph file.
+
+    window_fits_index: `int`
+        Index of the HDU holding the spectral window.
+
+    Returns
+    -------
+    window_meta: `dict`
+        Metadata of the spectral window.
+    """
+    detector_type = primary_header[f"TDET{window_fits_index}"]
+    if "FUV" in detector_type:
+        spectral_summing = primary_header["SUMSPTRF"]
+    else:
+        spectral_summing = primary_header["SUMSPTRN"]
+    return {"detector type": detector_type,
+            "spectral window": primary_header[f"TDESC{window_fits_index}"],
+            "brightest wavelength": primary_header[f"TWAVE{window_fits_index}"],
+            "min wavelength": primary_header[f"TWMIN{window_fits_index}"],
+            "max wavelength": primary_header[f"TWMAX{window_fits_index}"],
+            "SAT_ROT": primary_header["SAT_ROT"],
+            "spatial summing": primary_header["SUMSPAT"],
+            "spectral summing": spectral_summing}
+
+
+def _wcs_from_header(header, wcs_cache):
+    """
+    Returns a WCS for a FITS header, reusing one already parsed from an identical header.
+
+    Parameters
+    ----------
+    header: `astropy.io.fits.Header`
+        The header from which to derive the WCS.
+
+    wcs_cache: `dict`
+        Previously parsed WCS objects keyed by the string form of their header.
+        A new WCS is added if the header is not already present.
+
+    Returns
+    -------
+    wcs: `astropy.wcs.WCS`
+        A copy of the cached WCS so that it can be safely modified by the caller.
+    """
+    key = header.tostring()
+    wcs = wcs_cache.get(key)
+    if wcs is None:
+        wcs = wcs_cache.setdefault(key, WCS(header))
+    return wcs.deepcopy()
@@ -86,7 +86,7 @@ def read_spice_l2_fits(filenames, windows=None, memmap=True, read_dumbbells=Fals
         # Depending on type of file, combine data from different files into
         # SpectrogramSequences and RasterSequences.
         is_raster = "ras" in first_meta.get("FILENAME") and \
-            not any([window[1].meta.contains_dumbbell for window in cube_lists.values()])
+            not any(window[1].meta.contains_dumbbell for window in cube_lists.values())
         if is_raster:
             sequence_class = RasterSequence
         else:
@@ -102,8 +102,8 @@ def read_spice_l2_fits(filenames, windows=None, memmap=True, read_dumbbells=Fals
         # same spectral window, e.g. because they are dumbbell windows.
         first_sequence = window_sequences[0][1]
         first_spectral_window = first_sequence[0].meta.spectral_window
-        if all([window[1][0].meta.spectral_window == first_spectral_window
-                for window in window_sequences]):
+        if all(window[1][0].meta.spectral_window == first_spectral_window
+               for window in window_sequences):
             aligned_axes = tuple(range(len(first_sequence.dimensions)))
         else:
             aligned_axes = np.where(
@@ -192,32 +192,37 @@ class SpectrogramCube(NDCube, SpectrogramABC):
             self.instrument_axes = np.asarray(instrument_axes, dtype=str)
 
     def __str__(self):
+        # Coordinate properties can be expensive to calculate so only access each once.
         if self._time_name:
-            if self.time.isscalar:
-                time_period = self.time
+            times = self.time
+            if times.isscalar:
+                time_period = times
             else:
-                time_period = (str(self.time.min()), str(self.time.max()))
+                time_period = (str(times.min()), str(times.max()))
         else:
             time_period = None
         if self._longitude_name:
-            if self.lon.isscalar:
-                lon_range = self.lon
+            lons = self.lon
+            if lons.isscalar:
+                lon_range = lons
             else:
-                lon_range = u.Quantity([self.lon.min(), self.lon.max()])
+                lon_range = u.Quantity([lons.min(), lons.max()])
         else:
             lon_range = None
         if self._latitude_name:
-            if self.lat.isscalar:
-                lat_range = self.lat
+            lats = self.lat
+            if lats.isscalar:
+                lat_range = lats
             else:
-                lat_range = u.Quantity([self.lat.min(), self.lat.max()])
+                lat_range = u.Quantity([lats.min(), lats.max()])
         else:
             lat_range = None
         if self._spectral_name:
-            if self.spectral_axis.isscalar:
-                spectral_range = self.spectral_axis
+            spectral_vals = self.spectral_axis
+            if spectral_vals.isscalar:
+                spectral_range = spectral_vals
             else:
-                spectral_range = u.Quantity([self.spectral_axis.min(), self.spectral_axis.max()])
+                spectral_range = u.Quantity([spectral_vals.min(), spectral_vals.max()])
         else:
             spectral_range = None
         return (textwrap.dedent(f"""\
@@ -315,7 +320,7 @@ class SpectrogramCube(NDCube, SpectrogramABC):
 
     def apply_exposure_time_correction(self, undo=False, force=False):
         # Get exposure time in seconds.
-        exposure_time_s = self.exposure_time.to(u.s).value
+        exposure_time_s = self.exposure_time.to_value(u.s)
         # If exposure time is not scalar, change array's shape so that
         # it can be broadcast with data and uncertainty arrays.
         if not np.isscalar(exposure_time_s):
@@ -389,10 +394,9 @@ def _find_axis_name(supported_names, world_axis_physical_types, extra_coords):
 
 
 def _find_name_in_array(supported_names, names_array):
-    name_index = np.isin(names_array, supported_names)
-    if name_index.sum() > 0:
-        name_index = int(np.arange(len(names_array))[name_index])
-        return names_array[name_index]
+    name_index = np.flatnonzero(np.isin(names_array, supported_names))
+    if name_index.size > 0:
+        return names_array[name_index.item()]
 
 
 def _calculate_exposure_time_correction(data, uncertainty, unit, exposure_time, force=False):
@@ -112,9 +112,10 @@ class SpectrogramSequence(NDCubeSequence, SpectrogramABC):
     def __str__(self):
         data0 = self.data[0]
         if data0._time_name:
-            start_time = data0.time.value if data0.time.isscalar else data0.time.value.squeeze()[0]
-            data_1 = self.data[-1]
-            stop_time = data_1.time.value if data_1.time.isscalar else data_1.time.value.squeeze()[-1]
+            times0 = data0.time
+            start_time = times0.value if times0.isscalar else times0.value.squeeze()[0]
+            times_1 = self.data[-1].time
+            stop_time = times_1.value if times_1.isscalar else times_1.value.squeeze()[-1]
             time_period = start_time if start_time == stop_time else (start_time, stop_time)
         else:
             time_period = None
@@ -203,9 +204,9 @@ class RasterSequence(SpectrogramSequence):
                 self._single_scan_instrument_axes_types[self._common_axis] = \
                     self._slit_step_axis_name
             # Spectral axis name.
-            spectral_raster_index = [physical_type == (self.data[0]._spectral_name,)
-                                     for physical_type in self.data[0].array_axis_physical_types]
-            spectral_raster_index = np.arange(self.data[0].data.ndim)[spectral_raster_index]
+            spectral_raster_index = np.flatnonzero(
+                [physical_type == (self.data[0]._spectral_name,)
+                 for physical_type in self.data[0].array_axis_physical_types])
             if len(spectral_raster_index) == 1:
                 self._single_scan_instrument_axes_types[spectral_raster_index] = \
                     self._spectral_axis_name
@@ -0,0 +1,296 @@
+import astropy.units as u
+import numpy as np
+import pytest
+from astropy.io import fits
+from astropy.time import Time, TimeDelta
+from ndcube import NDCollection
+
+from sunraster import RasterSequence
+from sunraster.instr.iris import (BAD_PIXEL_VALUE, DN_UNIT, READOUT_NOISE,
+                                  read_iris_spectrograph_level2_fits)
+
+WINDOWS = (("C II 1336", "FUV1", 1335.7), ("Mg II k 2796", "NUV", 2796.2))
+AUX_COLUMNS = ("TIME", "PZTX", "PZTY", "EXPTIMEF", "EXPTIMEN", "XCENIX", "YCENIX",
+               "OBS_VRIX", "OPHASEIX")
+N_SLIT_STEPS = 4
+START_OBS = ("2017-05-02T05:25:51.050", "2017-05-02T05:26:29.050")
+
+
+def _write_iris_l2_file(filename, seed, start_obs, n_raster_positions=N_SLIT_STEPS,
+                        windows=WINDOWS, time_offsets=None):
+    """
+    Writes a small synthetic IRIS level 2 spectrograph FITS file.
+
+    Window data are stored as scaled integers like real level 2 files and include
+    some bad pixels.
+    """
+    rng = np.random.default_rng(seed)
+    n_steps = N_SLIT_STEPS if time_offsets is None else len(time_offsets)
+    header = fits.Header()
+    for key, value in [("TELESCOP", "IRIS"), ("INSTRUME", "SPEC"), ("DATA_LEV", 2.),
+                       ("OBSID", "3620258102"), ("OBS_DESC", "Synthetic OBS"),
+                       ("STARTOBS", start_obs), ("ENDOBS", "2017-05-02T06:00:00.000"),
+                       ("DATE_OBS", start_obs), ("DATE_END", "2017-05-02T06:00:00.000"),
+                       ("SAT_ROT", 0.1), ("AECNOBS", 0), ("FOVX", 5.3), ("FOVY", 119.),
+                       ("SUMSPTRN", 1), ("SUMSPTRF", 1), ("SUMSPAT", 1),
+                       ("NEXPOBS", n_steps), ("NRASTERP", n_raster_positions),
+                       ("KEYWDDOC", "https://www.lmsal.com/iris_science/irisfitskeywords.pdf"),
+                       ("HLZ", 0), ("SAA", 0), ("DSUN_OBS", 1.5e11), ("IAECEVFL", "NO"),
+                       ("IAECFLAG", "NO"), ("IAECFLFL", "NO"), ("NWIN", len(windows))]:
+        header[key] = value
+    for i, (name, detector, wavelength) in enumerate(windows, start=1):
+        header[f"TDESC{i}"] = name
+        header[f"TDET{i}"] = detector
+        header[f"TWAVE{i}"] = wavelength
+        header[f"TWMIN{i}"] = wavelength - 1
+        header[f"TWMAX{i}"] = wavelength + 1
+    hdus = [fits.PrimaryHDU(header=header)]
+    for name, detector, wavelength in windows:
+        data = rng.integers(-10, 500, size=(n_steps, 6, 5)).astype(np.float32)
+        data[0, 0, :2] = BAD_PIXEL_VALUE
+        window_header = fits.Header()
+        for key, value in [("CTYPE1", "WAVE"), ("CUNIT1", "Angstrom"),
+                           ("CRVAL1", wavelength), ("CDELT1", 0.025), ("CRPIX1", 1.),
+                           ("CTYPE2", "HPLT-TAN"), ("CUNIT2", "arcsec"), ("CRVAL2", 10.),
+                           ("CDELT2", 0.166), ("CRPIX2", 3.),
+                           ("CTYPE3", "HPLN-TAN"), ("CUNIT3", "arcsec"), ("CRVAL3", 20.),
+                           ("CDELT3", 0.35 if n_raster_positions > 1 else 0.),
+                           ("CRPIX3", 2.)]:
+            window_header[key] = value
+        hdu = fits.ImageHDU(data, header=window_header)
+        hdu.scale("int16", bscale=0.25, bzero=7992.)
+        hdus.append(hdu)
+    aux = rng.random((n_steps, len(AUX_COLUMNS)))
+    aux[:, AUX_COLUMNS.index("TIME")] = (np.arange(n_steps) * 9.5 if time_offsets is None
+                                         else time_offsets)
+    aux[:, AUX_COLUMNS.index("EXPTIMEF")] = 8.
+    aux[:, AUX_COLUMNS.index("EXPTIMEN")] = 4.
+    aux_header = fits.Header()
+    for i, column in enumerate(AUX_COLUMNS):
+        aux_header[column] = i
+    hdus.append(fits.ImageHDU(aux, header=aux_header))
+    hdus.append(fits.TableHDU.from_columns(
+        [fits.Column(name="FRMID", format="A10", array=np.array(["0"] * n_steps))]))
+    fits.HDUList(hdus).writeto(filename)
+    return filename
+
+
+@pytest.fixture(scope="session")
+def iris_raster_filenames(tmp_path_factory):
+    """Writes two synthetic IRIS raster files from the same OBS and returns their names."""
+    tmp_iris_path = tmp_path_factory.mktemp("iris")
+    return [_write_iris_l2_file(str(tmp_iris_path / f"iris_l2_raster_{i}.fits"), i, start_obs)
+            for i, start_obs in enumerate(START_OBS)]
+
+
+@pytest.fixture(scope="session")
+def iris_sns_filename(tmp_path_factory):
+    """Writes a synthetic IRIS sit-and-stare file and returns its name."""
+    tmp_iris_path = tmp_path_factory.mktemp("iris")
+    return _write_iris_l2_file(str(tmp_iris_path / "iris_l2_sns.fits"), 2, START_OBS[0],
+                               n_raster_positions=1)
+
+
+def _expected_uncertainty(data, detector):
+    photons = (data * DN_UNIT[detector]).to(u.photon)
+    readout_noise = READOUT_NOISE[detector].to(u.photon)
+    return np.sqrt(photons.value + readout_noise.value**2) * u.photon.to(DN_UNIT[detector])
+
+
+def _assert_cube_matches_file(cube, filename, hdu_index, detector, uncertainty=True,
+                              memmap=False):
+    # Memory-mapped data are left unscaled and unmasked.
+    with fits.open(filename, do_not_scale_image_data=memmap) as hdulist:
+        data = hdulist[hdu_index].data
+        window_header = hdulist[hdu_index].header
+        aux = hdulist[-2].data
+        start_obs = hdulist[0].header["STARTOBS"]
+        n_raster_positions = hdulist[0].header["NRASTERP"]
+        np.testing.assert_array_equal(cube.data, data)
+        assert cube.data.dtype == data.dtype
+        if memmap:
+            assert cube.mask is None
+        else:
+            np.testing.assert_array_equal(cube.mask, data == BAD_PIXEL_VALUE)
+        assert cube.unit == DN_UNIT[detector]
+        if uncertainty:
+            np.testing.assert_allclose(cube.uncertainty.array,
+                                       _expected_uncertainty(data, detector))
+        else:
+            assert cube.uncertainty is None
+        # Check WCS.
+        assert list(cube.wcs.wcs.ctype) == [window_header[f"CTYPE{i}"] for i in (1, 2, 3)]
+        np.testing.assert_allclose(cube.wcs.wcs.crpix,
+                                   [window_header[f"CRPIX{i}"] for i in (1, 2, 3)])
+        np.testing.assert_allclose(u.Quantity(cube.wcs.wcs.crval[:1], u.m).to_value(u.AA),
+                                   window_header["CRVAL1"])
+        # Check extra coords.
+        expected_times = Time(start_obs) + TimeDelta(aux[:, 0], format="sec")
+        np.testing.assert_allclose((cube.time - expected_times).to_value(u.s), 0, atol=1e-6)
+        assert cube.time.format == "isot"
+        extra_coords = cube.extra_coords
+        for name, column, unit in [("pztx", "PZTX", u.arcsec), ("pzty", "PZTY", u.arcsec),
+                                   ("xcenix", "XCENIX", u.arcsec),
+                                   ("ycenix", "YCENIX", u.arcsec),
+                                   ("obs_vrix", "OBS_VRIX", u.m / u.s)]:
+            assert u.allclose(extra_coords[name]["value"],
+                              aux[:, AUX_COLUMNS.index(column)] * unit)
+        np.testing.assert_array_equal(extra_coords["ophaseix"]["value"],
+                                      aux[:, AUX_COLUMNS.index("OPHASEIX")])
+        exposure_column = "EXPTIMEF" if detector == "FUV" else "EXPTIMEN"
+        assert u.allclose(cube.exposure_time, aux[:, AUX_COLUMNS.index(exposure_column)] * u.s)
+        if n_raster_positions > 1:
+            np.testing.assert_array_equal(extra_coords["raster position"]["value"],
+                                          np.arange(n_raster_positions))
+        else:
+            assert "raster position" not in extra_coords
+
+
+def test_read_iris_spectrograph_level2_fits_multiple_files(iris_raster_filenames):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames)
+    assert isinstance(result, NDCollection)
+    assert list(result.keys()) == [window[0] for window in WINDOWS]
+    assert result.meta["OBSID"] == "3620258102"
+    for hdu_index, window_name in enumerate(result.keys(), start=1):
+        sequence = result[window_name]
+        assert isinstance(sequence, RasterSequence)
+        assert len(sequence.data) == len(iris_raster_filenames)
+        assert sequence.meta["spectral window"] == window_name
+        detector = "FUV" if "FUV" in sequence.meta["detector type"] else "NUV"
+        # Cubes must be in the same order as the files.
+        for cube, filename in zip(sequence.data, iris_raster_filenames):
+            assert cube.meta["spectral window"] == window_name
+            _assert_cube_matches_file(cube, filename, hdu_index, detector)
+            with fits.open(filename) as hdulist:
+                np.testing.assert_allclose(cube.wcs.wcs.cdelt[2],
+                                           hdulist[hdu_index].header["CDELT3"] / 3600)
+
+
+def test_read_iris_spectrograph_level2_fits_single_filename(iris_raster_filenames):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames[0])
+    assert all(len(sequence.data) == 1 for sequence in result.values())
+    _assert_cube_matches_file(result["C II 1336"][0], iris_raster_filenames[0], 1, "FUV")
+
+
+def test_read_iris_spectrograph_level2_fits_sit_and_stare(iris_sns_filename):
+    result = read_iris_spectrograph_level2_fits(iris_sns_filename)
+    cube = result["Mg II k 2796"][0]
+    _assert_cube_matches_file(cube, iris_sns_filename, 2, "NUV")
+    # Zero CDELT3 is replaced by a tiny non-zero value in the WCS only.
+    assert cube.wcs.wcs.cdelt[2] != 0
+    with fits.open(iris_sns_filename) as hdulist:
+        assert hdulist[2].header["CDELT3"] == 0
+
+
+def test_read_iris_spectrograph_level2_fits_no_uncertainty(iris_raster_filenames):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames, uncertainty=False)
+    for hdu_index, window_name in enumerate(result.keys(), start=1):
+        detector = "FUV" if "FUV" in result[window_name].meta["detector type"] else "NUV"
+        for cube, filename in zip(result[window_name].data, iris_raster_filenames):
+            _assert_cube_matches_file(cube, filename, hdu_index, detector, uncertainty=False)
+
+
+def test_read_iris_spectrograph_level2_fits_long_window_name(tmp_path):
+    # Window names longer than 68 characters are stored using CONTINUE cards.
+    long_name = "Mg II k 2796 " + "x" * 68
+    windows = (WINDOWS[0], (long_name, "NUV", 2796.2))
+    filename = _write_iris_l2_file(str(tmp_path / "iris_l2_long_window_name.fits"), 4,
+                                   START_OBS[0], windows=windows)
+    result = read_iris_spectrograph_level2_fits(filename)
+    assert list(result.keys()) == [WINDOWS[0][0], long_name]
+    result = read_iris_spectrograph_level2_fits(filename, spectral_windows=long_name)
+    assert list(result.keys()) == [long_name]
+    assert result[long_name][0].meta["spectral window"] == long_name
+
+
+def test_read_iris_spectrograph_level2_fits_memmap(iris_raster_filenames):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames, memmap=True,
+                                                uncertainty=False)
+    for hdu_index, window_name in enumerate(result.keys(), start=1):
+        detector = "FUV" if "FUV" in result[window_name].meta["detector type"] else "NUV"
+        for cube, filename in zip(result[window_name].data, iris_raster_filenames):
+            assert cube.data.dtype.kind == "i"
+            _assert_cube_matches_file(cube, filename, hdu_index, detector, uncertainty=False,
+                                      memmap=True)
+
+
+def test_read_iris_spectrograph_level2_fits_time_across_leap_second(tmp_path):
+    start_obs = "2016-12-31T23:59:58.000"
+    time_offsets = np.array([0., 1., 2., 3.5])
+    filename = _write_iris_l2_file(str(tmp_path / "iris_l2_leap_second.fits"), 3, start_obs,
+                                   time_offsets=time_offsets)
+    result = read_iris_spectrograph_level2_fits(filename)
+    expected_times = Time(start_obs) + TimeDelta(time_offsets, format="sec")
+    for sequence in result.values():
+        times = sequence[0].time
+        assert (times == expected_times).all()
+        assert list(times.isot) == list(expected_times.isot)
+        assert times.isot[2] == "2016-12-31T23:59:60.000"
+        assert times.format == Time(start_obs).format
+
+
+def test_read_iris_spectrograph_level2_fits_windows_out_of_order(iris_raster_filenames):
+    requested_windows = [WINDOWS[1][0], WINDOWS[0][0]]
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames,
+                                                spectral_windows=requested_windows)
+    # Windows are returned in file order, not requested order.
+    assert list(result.keys()) == [window[0] for window in WINDOWS]
+    for hdu_index, (window_name, detector_type, wavelength) in enumerate(WINDOWS, start=1):
+        sequence = result[window_name]
+        detector = "FUV" if "FUV" in detector_type else "NUV"
+        assert sequence.meta["spectral window"] == window_name
+        assert sequence.meta["detector type"] == detector_type
+        assert sequence.meta["brightest wavelength"] == wavelength
+        for cube, filename in zip(sequence.data, iris_raster_filenames):
+            assert cube.meta["spectral window"] == window_name
+            _assert_cube_matches_file(cube, filename, hdu_index, detector)
+
+
+def test_read_iris_spectrograph_level2_fits_single_window(iris_raster_filenames):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames,
+                                                spectral_windows=WINDOWS[1][0])
+    assert list(result.keys()) == [WINDOWS[1][0]]
+    _assert_cube_matches_file(result[WINDOWS[1][0]][0], iris_raster_filenames[0], 2, "NUV")
+
+
+def test_read_iris_spectrograph_level2_fits_missing_window(iris_raster_filenames):
+    with pytest.raises(ValueError, match="Si IV 1403"):
+        read_iris_spectrograph_level2_fits(iris_raster_filenames,
+                                           spectral_windows=[WINDOWS[0][0], "Si IV 1403"])
+
+
+@pytest.mark.parametrize("memmap", [False, True])
+def test_read_iris_spectrograph_level2_fits_extra_coords_read_only(iris_raster_filenames,
+                                                                   memmap):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames, memmap=memmap,
+                                                uncertainty=False)
+    fuv_cube, nuv_cube = (result[window[0]][0] for window in WINDOWS)
+    # Coordinates are shared between windows without copying
+    assert np.shares_memory(fuv_cube.extra_coords["pztx"]["value"],
+                            nuv_cube.extra_coords["pztx"]["value"])
+    # so in-place changes must be prevented.
+    for coord in fuv_cube.extra_coords.values():
+        with pytest.raises(ValueError):
+            coord["value"][0] = coord["value"][1]
+
+
+def test_read_iris_spectrograph_level2_fits_time_attributes_independent(iris_raster_filenames):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames[0], uncertainty=False)
+    fuv_time, nuv_time = (result[window[0]][0].extra_coords["time"]["value"]
+                          for window in WINDOWS)
+    # Times share their values between windows but not their attributes.
+    assert np.shares_memory(fuv_time.jd1, nuv_time.jd1)
+    fuv_time.format = "jd"
+    fuv_time.precision = 6
+    assert nuv_time.format == "isot"
+    assert nuv_time.precision == 3
+
+
+def test_read_iris_spectrograph_level2_fits_meta_independent(iris_raster_filenames):
+    result = read_iris_spectrograph_level2_fits(iris_raster_filenames[0], uncertainty=False)
+    fuv_meta, nuv_meta = (result[window[0]][0].meta for window in WINDOWS)
+    fuv_meta["STARTOBS"].format = "jd"
+    fuv_meta["SAT_ROT"] += 1 * u.deg
+    assert nuv_meta["STARTOBS"].format == "isot"
+    assert u.allclose(nuv_meta["SAT_ROT"], fuv_meta["SAT_ROT"] - 1 * u.deg)
+    assert result[WINDOWS[1][0]][0].extra_coords["time"]["value"].format == "isot"
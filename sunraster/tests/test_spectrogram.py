@@ -137,6 +137,21 @@ def test_lat_error():
         spectrogram_NO_COORDS.lat
 
 
+def test_str():
+    output = str(spectrogram_DN0)
+    assert "Time Period: ('2017-01-01 00:00:00.000', '2017-01-01 00:00:01.000')" in output
+    assert "Spectral range: [1.02e-09 1.06e-09] m" in output
+    assert "Data unit: ct" in output
+
+
+def test_str_no_coords():
+    output = str(spectrogram_NO_COORDS)
+    assert "Time Period: None" in output
+    assert "Longitude range: None" in output
+    assert "Latitude range: None" in output
+    assert "Spectral range: None" in output
+
+
 @pytest.mark.parametrize("input_cube, undo, force, expected_cube", [
     (spectrogram_DN0, False, False, spectrogram_DN_per_s0),
     (spectrogram_DN_per_s0, True, False, spectrogram_DN0),
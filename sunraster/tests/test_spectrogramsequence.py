@@ -203,6 +203,12 @@ def test_lat():
     assert (sequence_DN.lat == lat).all()
 
 
+def test_str():
+    output = str(sequence_DN)
+    assert "Time Range: ('2017-01-01 00:00:00.000', '2017-01-01 00:00:03.000')" in output
+    assert "Data unit: ct" in output
+
+
 @pytest.mark.parametrize("input_sequence, undo, force, expected_sequence", [
     (sequence_DN, False, False, sequence_DN_per_s),
     (sequence_DN_per_s, True, False, sequence_DN),
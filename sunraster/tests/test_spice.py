@@ -87,12 +87,12 @@ def spice_meta(spice_fits_header):
                      comments=zip(spice_fits_header.keys(), spice_fits_header.comments))
 
 
-@pytest.fixture
-def spice_rasdb_filename(tmp_path):
+@pytest.fixture(scope="session")
+def spice_rasdb_filename(tmp_path_factory):
     """
     Inserts data into a raster SPICE FITS file with dumbbells and returns new filename.
 
-    A new FITS file is saved in a tmp file path.
+    A new FITS file is saved in a tmp file path once per test session.
     """
     filename = "solo_L2_spice-n-ras-db_20200602T081733_V01_12583760-000.fits"
     with fits.open(os.path.join(test_data_dir, filename)) as hdulist:
@@ -106,20 +106,18 @@ def spice_rasdb_filename(tmp_path):
         new_hdulist.append(fits.ImageHDU(np.random.rand(1, 56, 64, 30),
                                          header=hdulist[3].header))
         new_hdulist.append(hdulist[-1])
-        tmp_spice_path = tmp_path / "spice"
-        if not os.path.exists(tmp_spice_path):
-            tmp_spice_path.mkdir()
+        tmp_spice_path = tmp_path_factory.mktemp("spice")
         new_filename = os.path.join(tmp_spice_path, filename)
         new_hdulist.writeto(new_filename, overwrite=True)
     return new_filename
 
 
-@pytest.fixture
-def spice_sns_filename(tmp_path):
+@pytest.fixture(scope="session")
+def spice_sns_filename(tmp_path_factory):
     """
     Inserts data into a sit-and-stare SPICE FITS file and returns new filename.
 
-    A new FITS file is saved in a tmp file path.
+    A new FITS file is saved in a tmp file path once per test session.
     """
     filename = "solo_L2_spice-n-sit_20200620T235901_V01_16777431-000.fits"
     with fits.open(os.path.join(test_data_dir, filename)) as hdulist:
@@ -129,9 +127,7 @@ def spice_sns_filename(tmp_path):
         new_hdulist.append(fits.ImageHDU(np.random.rand(32, 48, 1024, 1),
                                          header=hdulist[1].header))
         new_hdulist.append(hdulist[-1])
-        tmp_spice_path = tmp_path / "spice"
-        if not os.path.exists(tmp_spice_path):
-            tmp_spice_path.mkdir()
+        tmp_spice_path = tmp_path_factory.mktemp("spice")
         new_filename = os.path.join(tmp_spice_path, filename)
         new_hdulist.writeto(new_filename, output_verify="fix+ignore", overwrite=True)
     return new_filename